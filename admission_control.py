@@ -0,0 +1,158 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional
+
+# Rough peak resident memory of each model on CPU in fp32, in MB
+WHISPER_MODEL_MB = {"small": 1800, "base": 700, "tiny": 500}
+SUMMARY_MODEL_MB = {"facebook/bart-large-cnn": 2200, "sshleifer/distilbart-cnn-6-6": 1300}
+
+# Transcription and summarization plans, best first; later entries are the downgrades
+WHISPER_MODELS = ["small", "base", "tiny"]
+SUMMARY_PLANS = [
+    ("facebook/bart-large-cnn", 4),
+    ("facebook/bart-large-cnn", 1),
+    ("sshleifer/distilbart-cnn-6-6", 1),
+    ("extractive", 0),
+]
+
+# Whisper keeps the whole waveform in float32 plus a few working copies
+AUDIO_MB_PER_SECOND = 16000 * 4 * 3 / (1024 * 1024)
+# pydub converts in memory: ffmpeg's raw output, the decoded 16-bit segment,
+# and the resampled and mono copies of it are alive at the same time
+CONVERSION_COPIES = 4
+# Encoder/decoder activations for one chunk (up to 700 words, within 1024 tokens)
+SUMMARY_CHUNK_MB = 150
+# How long a job queues for its best plan before taking a cheaper one that fits
+DOWNGRADE_AFTER = 60
+DEFAULT_QUEUE_TIMEOUT = 600
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when a job cannot be admitted within the memory budget"""
+
+class JobPlan(NamedTuple):
+    """Model choice for a job and its estimated peak memory in MB"""
+    model: str
+    batch_size: int
+    memory_mb: int
+
+def default_memory_budget_mb() -> int:
+    """Read the budget from MEETING_MEMORY_BUDGET_MB, else use 75% of physical memory"""
+    configured = os.environ.get("MEETING_MEMORY_BUDGET_MB")
+    if configured:
+        return int(configured)
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return 8192
+    return int(total * 0.75 / (1024 * 1024))
+
+def estimate_conversion_mb(duration_seconds: float, sample_rate: int = 48000, channels: int = 2) -> int:
+    """Estimate peak memory for converting the input to 16kHz mono WAV with pydub"""
+    return int(duration_seconds * sample_rate * channels * 2 * CONVERSION_COPIES / (1024 * 1024))
+
+def estimate_transcription_mb(duration_seconds: float, model: str = "small",
+                              sample_rate: int = 48000, channels: int = 2) -> int:
+    """Estimate peak memory for converting and transcribing audio of the given length
+
+    Conversion finishes before the model loads, so the peak is the larger of the two.
+    """
+    whisper_mb = WHISPER_MODEL_MB[model] + duration_seconds * AUDIO_MB_PER_SECOND
+    return int(max(whisper_mb, estimate_conversion_mb(duration_seconds, sample_rate, channels)))
+
+def estimate_summary_mb(model: str, batch_size: int) -> int:
+    """Estimate peak memory for summarizing with the given model and batch size"""
+    if model == "extractive":
+        return 50
+    return SUMMARY_MODEL_MB[model] + SUMMARY_CHUNK_MB * batch_size
+
+class MemoryAdmissionController:
+    """Admit jobs only while their estimated peak memory fits the budget
+
+    Jobs reserve their estimate for as long as they run. A job queues for
+    the best plan that fits the budget at all, and only takes a cheaper
+    plan that fits the free memory once it has waited DOWNGRADE_AFTER
+    seconds. Jobs whose cheapest plan exceeds the budget are refused.
+    """
+
+    def __init__(self, budget_mb: Optional[int] = None):
+        self.budget_mb = budget_mb or default_memory_budget_mb()
+        self._condition = threading.Condition()
+        self._reserved = {}
+        self._next_job = 0
+
+    def free_mb(self) -> int:
+        with self._condition:
+            return self.budget_mb - sum(self._reserved.values())
+
+    def transcription_plans(self, duration_seconds: float, sample_rate: int = 48000,
+                            channels: int = 2) -> List[JobPlan]:
+        """Whisper plans for input audio of the given length and format, best first"""
+        return [JobPlan(model, 1, estimate_transcription_mb(duration_seconds, model, sample_rate, channels))
+                for model in WHISPER_MODELS]
+
+    def summary_plans(self) -> List[JobPlan]:
+        """Summarization model and batch size plans, best first"""
+        return [JobPlan(model, batch_size, estimate_summary_mb(model, batch_size))
+                for model, batch_size in SUMMARY_PLANS]
+
+    @contextmanager
+    def admit(self, plans: List[JobPlan], downgrade_after: float = DOWNGRADE_AFTER,
+              timeout: float = DEFAULT_QUEUE_TIMEOUT):
+        """Pick a plan and reserve its memory for the enclosed job, yielding the plan
+
+        Choosing and reserving happen under one lock, so no other job can
+        take the memory in between.
+        """
+        with self._condition:
+            admissible = [plan for plan in plans if plan.memory_mb <= self.budget_mb]
+            if not admissible:
+                cheapest = min(plan.memory_mb for plan in plans)
+                raise MemoryBudgetExceeded(
+                    f"Job needs at least {cheapest}MB but the budget is {self.budget_mb}MB")
+            start = time.monotonic()
+            announced = False
+            while True:
+                free = self.budget_mb - sum(self._reserved.values())
+                waited = time.monotonic() - start
+                options = admissible if waited >= downgrade_after else admissible[:1]
+                plan = next((option for option in options if option.memory_mb <= free), None)
+                if plan is not None:
+                    break
+                if waited >= timeout:
+                    raise MemoryBudgetExceeded(
+                        f"Timed out waiting for memory: {free}MB of the {self.budget_mb}MB budget free")
+                if not announced:
+                    print(f"Waiting for memory: {admissible[0].memory_mb}MB needed, {free}MB free")
+                    announced = True
+                wait_until = downgrade_after if waited < downgrade_after else timeout
+                self._condition.wait(timeout=wait_until - waited)
+            if plan is not admissible[0]:
+                print(f"Downgrading to {plan.model} after waiting {waited:.0f}s for memory")
+            job = self._next_job
+            self._next_job += 1
+            self._reserved[job] = plan.memory_mb
+        try:
+            yield plan
+        finally:
+            with self._condition:
+                del self._reserved[job]
+                self._condition.notify_all()
+
+    def status(self) -> Dict[str, int]:
+        """Report the budget, memory reserved by running jobs and job count"""
+        with self._condition:
+            reserved = sum(self._reserved.values())
+            return {"budget_mb": self.budget_mb, "reserved_mb": reserved, "running_jobs": len(self._reserved)}
+
+_controller = None
+_controller_lock = threading.Lock()
+
+def get_admission_controller() -> MemoryAdmissionController:
+    """Return the process-wide admission controller, creating it on first use"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = MemoryAdmissionController()
+        return _controller
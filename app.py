@@ -1,8 +1,7 @@
 import streamlit as st
 import os
-from transcribe_audio import transcribe_audio
-from summarize_text import summarize_text
 from audio_recorder import AudioRecorder
+from transcription_profiles import DECODING_PROFILES, DEFAULT_DECODING, get_profile, save_profile
 import time
 from datetime import datetime
 
@@ -14,6 +13,8 @@ def initialize_session_state():
         st.session_state.recorded_file = None
     if 'theme' not in st.session_state:
         st.session_state.theme = "light"
+    if 'decoding' not in st.session_state:
+        st.session_state.decoding = DEFAULT_DECODING
 
 def apply_theme_css():
     """Apply theme-specific CSS with consistent dark theme"""
@@ -276,6 +277,43 @@ def main():
         if st.button(f"{theme_emoji} Switch to {'Dark' if st.session_state.theme == 'light' else 'Light'} Theme", key="theme_toggle"):
             st.session_state.theme = "dark" if st.session_state.theme == "light" else "light"
             st.rerun()
+        
+        st.subheader("🗣️ Transcription")
+        profile_name = st.text_input(
+            "Profile",
+            key="profile_name",
+            help="A user or channel name. Its language and vocabulary are remembered between meetings."
+        )
+        if profile_name:
+            profile = get_profile(profile_name)
+            saved_vocabulary = ", ".join(profile.get("vocabulary", []))
+            vocabulary = st.text_input(
+                "Vocabulary",
+                value=saved_vocabulary,
+                help="Comma-separated names and terms that come up in these meetings"
+            )
+            if vocabulary != saved_vocabulary:
+                save_profile(profile_name, vocabulary=vocabulary.split(","))
+            if profile.get("language"):
+                st.caption(f"Language: {profile['language']}")
+        st.selectbox(
+            "Decoding",
+            list(DECODING_PROFILES),
+            key="decoding",
+            help="fast: single greedy pass. balanced: greedy with fallback. accurate: beam search with fallback."
+        )
+        
+        with st.expander("🧮 CPU Allocation"):
+            from resource_manager import get_resource_manager
+            cpu_manager = get_resource_manager()
+            st.write("Cores per worker slot")
+            st.json(cpu_manager.allocation())
+            st.write("Utilization by role")
+            st.json(cpu_manager.utilization())
+        
+        with st.expander("💾 Memory Budget"):
+            from admission_control import get_admission_controller
+            st.json(get_admission_controller().status())
 
     # Main content - removed the outer main-content-wrapper div
     st.markdown('''
@@ -327,7 +365,7 @@ def main():
                                 f.write(uploaded_file.getbuffer())
                         
                         # Process the audio
-                        process_audio_file("uploaded_audio.wav")
+                        process_audio_file("uploaded_audio.wav", uploaded_file.name)
                         
                         # Clean up
                         try:
@@ -416,12 +454,25 @@ def main():
                 st.error(f"Error loading audio file: {str(e)}")
         st.markdown('</div>', unsafe_allow_html=True)
 
-def process_audio_file(audio_path):
-    """Process an audio file to generate transcript and summary"""
+def process_audio_file(audio_path, title=None):
+    """Process an audio file to generate transcript and summary, archiving it under title (default: the file name)"""
+    # Imported here so the page renders before the model stacks are loaded
+    from transcribe_audio import transcribe_audio
+    from summarize_text import summarize_text
+    from meeting_archive import archive_meeting
+    from resource_manager import get_resource_manager
+
+    cpu_manager = get_resource_manager()
+
     try:
         # Transcription progress
         with st.spinner("🎯 Transcribing audio... This may take a few minutes."):
-            success = transcribe_audio(audio_path)
+            with cpu_manager.worker("transcribe"):
+                success = transcribe_audio(
+                    audio_path,
+                    st.session_state.get("profile_name") or None,
+                    st.session_state.decoding
+                )
             if not success:
                 st.error("❌ Error during transcription. Please try again.")
                 return
@@ -430,13 +481,18 @@ def process_audio_file(audio_path):
         
         # Summarization progress
         with st.spinner("📝 Generating summary..."):
-            success = summarize_text("transcript.txt", "summary.txt")
+            with cpu_manager.worker("summarize"):
+                success = summarize_text("transcript.txt", "summary.txt")
             if not success:
                 st.error("❌ Error during summarization. Please try again.")
                 return
             
             st.success("✅ Summary generated!")
         
+        # Keep a searchable copy of this meeting
+        if not archive_meeting("transcript.txt", "summary.txt", title or os.path.basename(audio_path)):
+            st.warning("⚠️ Could not add this meeting to the archive.")
+        
         # Create a new card for results
         st.markdown("""
             <div style="height: 2rem;"></div>
@@ -0,0 +1,60 @@
+import sys
+import os
+import subprocess
+
+# Modules whose import must stay cheap, and the heavy packages they must not pull in
+LIGHT_MODULES = [
+    "transcription_profiles",
+    "resource_manager",
+    "admission_control",
+    "meeting_archive",
+    "transcribe_audio",
+    "summarize_text",
+]
+HEAVY_MODULES = ["torch", "whisper", "transformers", "pydub"]
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+for name in {LIGHT_MODULES!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(elapsed)
+print(",".join(loaded))
+"""
+
+def check_startup(budget_seconds: float = IMPORT_BUDGET_SECONDS) -> bool:
+    """
+    Import the app's pipeline modules in a fresh interpreter and check that
+    no heavy dependency is loaded and the imports stay within the time budget
+    """
+    result = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        print(f"❌ Import failed:\n{result.stderr}")
+        return False
+
+    lines = result.stdout.splitlines()
+    elapsed = float(lines[0])
+    loaded = lines[1] if len(lines) > 1 else ""
+    ok = True
+    if loaded:
+        print(f"❌ Heavy modules imported at startup: {loaded}")
+        ok = False
+    if elapsed > budget_seconds:
+        print(f"❌ Import took {elapsed:.3f}s, budget is {budget_seconds:.3f}s")
+        ok = False
+    if ok:
+        print(f"✅ Startup imports took {elapsed:.3f}s with no heavy modules loaded")
+    return ok
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: python check_startup.py [budget_seconds]")
+        sys.exit(1)
+
+    budget = float(sys.argv[1]) if len(sys.argv) == 2 else IMPORT_BUDGET_SECONDS
+    if not check_startup(budget):
+        sys.exit(1)
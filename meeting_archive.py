@@ -0,0 +1,692 @@
+import sys
+import os
+import re
+import json
+import math
+import mmap
+import heapq
+import struct
+import threading
+from itertools import accumulate
+from contextlib import contextmanager
+from datetime import datetime, time as day_time
+from typing import Dict, List, Optional, Tuple
+
+from summarize_text import clean_text, extract_key_points, extract_action_items
+
+try:
+    import fcntl
+except ImportError:  # Windows: only writers in the same process are serialized
+    fcntl = None
+
+ARCHIVE_DIR = "meeting_archive"
+# One skip pointer is kept for every SKIP_INTERVAL postings entries of a term
+SKIP_INTERVAL = 64
+
+# Ranking weight of each indexed field: transcript, key points, action items
+FIELD_WEIGHTS = [1.0, 2.0, 3.0]
+
+_write_lock = threading.Lock()
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase index terms"""
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Append an unsigned integer as a little-endian base-128 varint"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Read a varint at pos and return (value, next position)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def pack_postings(count: int, skips: List[Tuple[int, int, int]], body: bytes) -> bytes:
+    """Prefix encoded entries with their count and skip table
+
+    Skip pointers are (id of the entry before, byte offset in the body,
+    entry index), delta-encoded; the table's byte size comes first so that
+    reads which don't need the skips can jump straight to the entries.
+    """
+    table = bytearray()
+    previous = (0, 0, 0)
+    for skip in skips:
+        for value, before in zip(skip, previous):
+            encode_varint(value - before, table)
+        previous = skip
+    out = bytearray()
+    encode_varint(count, out)
+    encode_varint(len(table), out)
+    return bytes(out + table + body)
+
+def read_header(data: bytes, with_skips: bool = True) -> Tuple[int, List[Tuple[int, int, int]], int]:
+    """Read the count and skip table of encoded postings
+
+    Returns (entry count, skip pointers, position of the first entry); the
+    skips are only decoded when asked for.
+    """
+    count, pos = decode_varint(data, 0)
+    table_size, pos = decode_varint(data, pos)
+    body = pos + table_size
+    skips = []
+    if with_skips:
+        skip_id = offset = index = 0
+        while pos < body:
+            delta, pos = decode_varint(data, pos)
+            skip_id += delta
+            delta, pos = decode_varint(data, pos)
+            offset += delta
+            delta, pos = decode_varint(data, pos)
+            index += delta
+            skips.append((skip_id, offset, index))
+    return count, skips, body
+
+def encode_postings(entries: List[Tuple[int, int, List[int]]]) -> bytes:
+    """Encode (meeting id, field, positions) entries sorted by meeting and field
+
+    Meeting ids and positions are delta-encoded, so most values fit in a byte.
+    Each entry records the byte length of its positions so that queries which
+    only need term counts can skip over them. A skip pointer is kept at most
+    every SKIP_INTERVAL entries, always at the start of a meeting, so lookups
+    of specific meetings can jump over whole blocks.
+    """
+    body = bytearray()
+    skips = []
+    last_skip = 0
+    previous_id = 0
+    for index, (meeting_id, field, positions) in enumerate(entries):
+        if index - last_skip >= SKIP_INTERVAL and meeting_id != previous_id:
+            skips.append((previous_id, len(body), index))
+            last_skip = index
+        position_bytes = bytearray()
+        previous_position = 0
+        for position in positions:
+            encode_varint(position - previous_position, position_bytes)
+            previous_position = position
+        encode_varint(meeting_id - previous_id, body)
+        encode_varint(field, body)
+        encode_varint(len(positions), body)
+        encode_varint(len(position_bytes), body)
+        body += position_bytes
+        previous_id = meeting_id
+    return pack_postings(len(entries), skips, body)
+
+def decode_postings(data: bytes, with_positions: bool = True,
+                    wanted: Optional[List[int]] = None) -> List[Tuple[int, int, List[int]]]:
+    """Decode postings written by encode_postings
+
+    Without positions, each entry carries [count] in place of the position list.
+    With a sorted wanted list of meeting ids, only their entries are decoded;
+    the skip pointers jump over blocks that hold none of them, and decoding
+    stops once every wanted id has been passed.
+    """
+    _, skips, pos = read_header(data, wanted is not None)
+    body = pos
+    end = len(data)
+    entries = []
+    meeting_id = 0
+    wanted_index = 0
+    skip_index = 0
+    skip_count = len(skips)
+    wanted_count = len(wanted) if wanted is not None else 0
+    while pos < end:
+        if wanted is not None:
+            if wanted_index == wanted_count:
+                break
+            target = wanted[wanted_index]
+            while skip_index < skip_count and skips[skip_index][0] < target:
+                if body + skips[skip_index][1] > pos:
+                    meeting_id = skips[skip_index][0]
+                    pos = body + skips[skip_index][1]
+                skip_index += 1
+        # Header values almost always fit in one byte; skip the call for those
+        delta = data[pos]
+        if delta < 0x80:
+            pos += 1
+        else:
+            delta, pos = decode_varint(data, pos)
+        field = data[pos]
+        pos += 1
+        length = data[pos]
+        if length < 0x80:
+            pos += 1
+        else:
+            length, pos = decode_varint(data, pos)
+        size = data[pos]
+        if size < 0x80:
+            pos += 1
+        else:
+            size, pos = decode_varint(data, pos)
+        meeting_id += delta
+        if wanted is not None:
+            while wanted_index < wanted_count and wanted[wanted_index] < meeting_id:
+                wanted_index += 1
+            if wanted_index == wanted_count or wanted[wanted_index] != meeting_id:
+                pos += size
+                continue
+        if not with_positions:
+            entries.append((meeting_id, field, [length]))
+            pos += size
+            continue
+        if size == length:
+            # Every gap fits in a single byte, so the bytes are the gaps
+            positions = list(accumulate(data[pos:pos + size]))
+            pos += size
+        else:
+            positions = []
+            position = 0
+            for _ in range(length):
+                gap, pos = decode_varint(data, pos)
+                position += gap
+                positions.append(position)
+        entries.append((meeting_id, field, positions))
+    return entries
+
+def concat_postings(parts: List[Tuple[bytes, int]]) -> bytes:
+    """Join encoded postings whose meeting ids increase from one part to the next
+
+    Each part is (encoded postings, last meeting id in it). Only the first id
+    delta of every part needs re-basing, so no entries are decoded. Skip
+    pointers are shifted to their new offsets and thinned back to one per
+    SKIP_INTERVAL entries, with part boundaries as extra candidates.
+    """
+    total = 0
+    body = bytearray()
+    skips = []
+    last_skip = 0
+    previous_id = 0
+    for data, last_id in parts:
+        count, part_skips, start = read_header(data)
+        if total - last_skip >= SKIP_INTERVAL:
+            skips.append((previous_id, len(body), total))
+            last_skip = total
+        first_id, rest = decode_varint(data, start)
+        encode_varint(first_id - previous_id, body)
+        shift = len(body) + start - rest
+        body += data[rest:]
+        for skip_id, offset, index in part_skips:
+            if total + index - last_skip >= SKIP_INTERVAL:
+                skips.append((skip_id, offset + shift, total + index))
+                last_skip = total + index
+        total += count
+        previous_id = last_id
+    return pack_postings(total, skips, body)
+
+def encode_lexicon(lexicon: Dict[str, List[int]]) -> bytes:
+    """Encode a segment lexicon for lookup without parsing the whole file
+
+    Layout: term count, then a table of record offsets (both little-endian
+    uint32), then one record per term in sorted order: the term's length
+    and UTF-8 bytes followed by its offset, length, document frequency and
+    last meeting id as varints.
+    """
+    terms = sorted(term.encode("utf-8") for term in lexicon)
+    records = bytearray()
+    offsets = []
+    table_size = 4 + 4 * len(terms)
+    for term in terms:
+        offsets.append(table_size + len(records))
+        encode_varint(len(term), records)
+        records += term
+        for value in lexicon[term.decode("utf-8")]:
+            encode_varint(value, records)
+    return struct.pack(f"<I{len(terms)}I", len(terms), *offsets) + bytes(records)
+
+class SegmentLexicon:
+    """Read-only view of an encoded lexicon, found by binary search over the sorted terms"""
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._count = struct.unpack_from("<I", data, 0)[0]
+
+    def _record(self, index: int) -> Tuple[bytes, int]:
+        pos = struct.unpack_from("<I", self._data, 4 + 4 * index)[0]
+        length, pos = decode_varint(self._data, pos)
+        return self._data[pos:pos + length], pos + length
+
+    def _values(self, pos: int) -> List[int]:
+        values = []
+        for _ in range(4):
+            value, pos = decode_varint(self._data, pos)
+            values.append(value)
+        return values
+
+    def get(self, term: str) -> Optional[List[int]]:
+        """Return [offset, length, document frequency, last meeting id], or None"""
+        key = term.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            found, pos = self._record(middle)
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return self._values(pos)
+        return None
+
+    def items(self):
+        """Yield (term, values) pairs in term order"""
+        for index in range(self._count):
+            term, pos = self._record(index)
+            yield term.decode("utf-8"), self._values(pos)
+
+def map_file(path: str) -> bytes:
+    """Memory-map a file read-only, reading empty files (which can't be mapped) as no bytes"""
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def parse_query(query: str) -> Tuple[List[List[str]], List[str]]:
+    """Split a query into quoted phrases and loose terms"""
+    phrases = [tokenize(phrase) for phrase in re.findall(r'"([^"]+)"', query)]
+    terms = tokenize(re.sub(r'"[^"]*"', ' ', query))
+    return [phrase for phrase in phrases if phrase], terms
+
+def phrase_keys(phrase: List[str]) -> List[str]:
+    """Return the index keys of a phrase: its word pairs, or the word itself
+
+    Adjacent word pairs are indexed as "first second", so a phrase made of
+    common words is looked up by pairs that are much rarer than its words.
+    """
+    if len(phrase) == 1:
+        return phrase
+    return [f"{first} {second}" for first, second in zip(phrase, phrase[1:])]
+
+def parse_time(value: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+    """Parse an ISO date or datetime, passing None through
+
+    With end_of_day, a date without a time means the last moment of that
+    day, so an until bound of "2026-01-01" still includes that day's meetings.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        parsed = datetime.combine(parsed.date(), day_time.max)
+    return parsed
+
+class MeetingArchive:
+    """Persistent archive of processed meetings with an inverted index
+
+    Every added meeting is written as a small index segment, so adding a
+    meeting never rewrites the existing postings. The newest segment is
+    merged into the one before it while it holds at least as many meetings,
+    which keeps the number of segments logarithmic in the archive size.
+    Writers hold a lock on the archive and reload its state first, so
+    archives opened by several sessions or processes stay consistent.
+    """
+
+    def __init__(self, archive_dir: str = ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        self.index_dir = os.path.join(archive_dir, "index")
+        os.makedirs(self.index_dir, exist_ok=True)
+        self.meetings = {}
+        self.manifest = {"segments": [], "next_segment": 0}
+        self._recorded_at = {}
+        self._segments = {}
+        self._loaded_state = None
+        self._refresh()
+
+    def _meetings_file(self) -> str:
+        return os.path.join(self.archive_dir, "meetings.jsonl")
+
+    def _manifest_file(self) -> str:
+        return os.path.join(self.index_dir, "manifest.json")
+
+    @contextmanager
+    def _locked(self):
+        """Serialize writers across threads and, where supported, processes"""
+        with _write_lock:
+            with open(os.path.join(self.archive_dir, ".lock"), "a") as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _file_state(self) -> tuple:
+        states = []
+        for path in (self._meetings_file(), self._manifest_file()):
+            try:
+                stat = os.stat(path)
+                states.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                states.append(None)
+        return tuple(states)
+
+    def _refresh(self) -> None:
+        """Reload meetings and the manifest if another writer changed them"""
+        state = self._file_state()
+        if state == self._loaded_state:
+            return
+        self.meetings = self._load_meetings()
+        self._recorded_at = {meeting_id: datetime.fromisoformat(meeting["recorded_at"])
+                             for meeting_id, meeting in self.meetings.items()}
+        self.manifest = self._load_manifest()
+        names = {name for name, _ in self.manifest["segments"]}
+        self._segments = {name: segment for name, segment in self._segments.items() if name in names}
+        self._loaded_state = state
+
+    def _load_meetings(self) -> Dict[int, dict]:
+        meetings = {}
+        if os.path.exists(self._meetings_file()):
+            with open(self._meetings_file(), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        meeting = json.loads(line)
+                        meetings[meeting["id"]] = meeting
+        return meetings
+
+    def _load_manifest(self) -> dict:
+        if os.path.exists(self._manifest_file()):
+            with open(self._manifest_file(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {"segments": [], "next_segment": 0}
+
+    def _save_manifest(self) -> None:
+        temp_file = self._manifest_file() + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+        os.replace(temp_file, self._manifest_file())
+
+    def _segment_paths(self, name: str) -> Tuple[str, str]:
+        base = os.path.join(self.index_dir, name)
+        return base + ".lex", base + ".post"
+
+    def _load_segment(self, name: str) -> Tuple[SegmentLexicon, bytes]:
+        """Map a segment's lexicon and postings, keeping them for later queries
+
+        Both files are memory-mapped, so opening a segment parses nothing and
+        a query only reads the pages of the terms it looks up.
+        """
+        if name not in self._segments:
+            lexicon_path, postings_path = self._segment_paths(name)
+            self._segments[name] = (SegmentLexicon(map_file(lexicon_path)), map_file(postings_path))
+        return self._segments[name]
+
+    def _new_segment_name(self) -> str:
+        name = f"segment_{self.manifest['next_segment']:06d}"
+        self.manifest["next_segment"] += 1
+        return name
+
+    def _write_segment(self, postings_by_term: Dict[str, List[Tuple[int, int, List[int]]]]) -> str:
+        """Write a new segment and return its name
+
+        The lexicon maps each term to [offset, length, document frequency,
+        last meeting id] within the segment's postings file; see encode_lexicon.
+        """
+        name = self._new_segment_name()
+        lexicon = {}
+        data = bytearray()
+        for term in sorted(postings_by_term):
+            entries = sorted(postings_by_term[term], key=lambda entry: (entry[0], entry[1]))
+            encoded = encode_postings(entries)
+            document_frequency = len({entry[0] for entry in entries})
+            lexicon[term] = [len(data), len(encoded), document_frequency, entries[-1][0]]
+            data += encoded
+        self._save_segment(name, lexicon, bytes(data))
+        return name
+
+    def _save_segment(self, name: str, lexicon: Dict[str, List[int]], data: bytes) -> None:
+        lexicon_path, postings_path = self._segment_paths(name)
+        with open(postings_path, "wb") as f:
+            f.write(data)
+        with open(lexicon_path, "wb") as f:
+            f.write(encode_lexicon(lexicon))
+
+    def _term_entries(self, term: str, with_positions: bool = True,
+                      wanted: Optional[List[int]] = None) -> List[Tuple[int, int, List[int]]]:
+        """Collect the postings for a term across all segments, optionally only for wanted ids"""
+        entries = []
+        for name, _ in self.manifest["segments"]:
+            lexicon, postings = self._load_segment(name)
+            values = lexicon.get(term)
+            if values:
+                offset, length = values[:2]
+                entries.extend(decode_postings(postings[offset:offset + length], with_positions, wanted))
+        return entries
+
+    def _document_frequency(self, term: str) -> int:
+        frequency = 0
+        for name, _ in self.manifest["segments"]:
+            values = self._load_segment(name)[0].get(term)
+            if values:
+                frequency += values[2]
+        return frequency
+
+    def add_meeting(self, transcript: str, summary: str = "", title: str = "",
+                    recorded_at: Optional[datetime] = None) -> int:
+        """Store a processed meeting and index it, returning its id"""
+        recorded_at = recorded_at or datetime.now()
+        key_points = extract_key_points(clean_text(transcript))
+        # Each field is a list of passages; phrases never match across passages
+        field_passages = [[transcript], key_points, extract_action_items(key_points)]
+
+        with self._locked():
+            self._refresh()
+            meeting_id = max(self.meetings, default=0) + 1
+            meeting_dir = os.path.join(self.archive_dir, "meetings", str(meeting_id))
+            os.makedirs(meeting_dir, exist_ok=True)
+            with open(os.path.join(meeting_dir, "transcript.txt"), "w", encoding="utf-8") as f:
+                f.write(transcript)
+            with open(os.path.join(meeting_dir, "summary.txt"), "w", encoding="utf-8") as f:
+                f.write(summary)
+
+            postings_by_term = {}
+            for field, passages in enumerate(field_passages):
+                positions_by_term = {}
+                start = 0
+                for passage in passages:
+                    tokens = tokenize(passage)
+                    for position, term in enumerate(tokens, start):
+                        positions_by_term.setdefault(term, []).append(position)
+                    for position, pair in enumerate(phrase_keys(tokens) if len(tokens) > 1 else [], start):
+                        positions_by_term.setdefault(pair, []).append(position)
+                    # Leave a gap so longer phrases can't line up across passages
+                    start += len(tokens) + 1
+                for term, positions in positions_by_term.items():
+                    postings_by_term.setdefault(term, []).append((meeting_id, field, positions))
+
+            self.manifest["segments"].append([self._write_segment(postings_by_term), 1])
+            meeting = {
+                "id": meeting_id,
+                "title": title or f"Meeting {meeting_id}",
+                "recorded_at": recorded_at.isoformat(timespec="seconds")
+            }
+            with open(self._meetings_file(), "a", encoding="utf-8") as f:
+                f.write(json.dumps(meeting) + "\n")
+            self.meetings[meeting_id] = meeting
+            self._recorded_at[meeting_id] = datetime.fromisoformat(meeting["recorded_at"])
+            self._save_manifest()
+
+            while (len(self.manifest["segments"]) > 1
+                   and self.manifest["segments"][-1][1] >= self.manifest["segments"][-2][1]):
+                self._merge_segments(2)
+            self._loaded_state = self._file_state()
+        return meeting_id
+
+    def merge_segments(self, count: Optional[int] = None) -> None:
+        """Rewrite the newest count segments (all by default) as a single segment"""
+        with self._locked():
+            self._refresh()
+            self._merge_segments(count)
+            self._loaded_state = self._file_state()
+
+    def _merge_segments(self, count: Optional[int]) -> None:
+        segments = self.manifest["segments"]
+        count = len(segments) if count is None else count
+        if count < 2:
+            return
+        old_segments = segments[-count:]
+        # Segments cover increasing, disjoint meeting id ranges, so each term's
+        # postings can be joined in segment order without decoding them
+        parts_by_term = {}
+        for name, _ in old_segments:
+            lexicon, postings = self._load_segment(name)
+            for term, (offset, length, document_frequency, last_id) in lexicon.items():
+                parts_by_term.setdefault(term, []).append(
+                    (postings[offset:offset + length], document_frequency, last_id))
+        name = self._new_segment_name()
+        lexicon = {}
+        data = bytearray()
+        for term in sorted(parts_by_term):
+            parts = parts_by_term[term]
+            encoded = concat_postings([(part, last_id) for part, _, last_id in parts])
+            lexicon[term] = [len(data), len(encoded), sum(part[1] for part in parts), parts[-1][2]]
+            data += encoded
+        self._save_segment(name, lexicon, bytes(data))
+        meeting_count = sum(size for _, size in old_segments)
+        self.manifest["segments"] = segments[:-count] + [[name, meeting_count]]
+        self._save_manifest()
+        for name, _ in old_segments:
+            self._segments.pop(name, None)
+            for path in self._segment_paths(name):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def search(self, query: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+               limit: int = 10) -> List[dict]:
+        """Find meetings matching every term and quoted phrase in the query
+
+        Results are ranked by a field-weighted tf-idf score, with action items
+        counting more than key points and key points more than the transcript.
+        """
+        try:
+            self._refresh()
+            return self._search(query, since, until, limit)
+        except FileNotFoundError:
+            # A writer merged away a segment we were about to read
+            self._loaded_state = None
+            self._refresh()
+            return self._search(query, since, until, limit)
+
+    def _search(self, query: str, since: Optional[datetime], until: Optional[datetime],
+                limit: int) -> List[dict]:
+        phrases, terms = parse_query(query)
+        phrases = [phrase_keys(phrase) for phrase in phrases]
+        words = set(terms).union(*phrases)
+        if not words:
+            return []
+        frequencies = {word: self._document_frequency(word) for word in words}
+        if not all(frequencies.values()):
+            return []
+
+        # Intersect meeting ids from the rarest term or word pair up, decoding
+        # only counts and only for the meetings still in the running
+        candidates = None
+        weighted_counts = {}
+        for word in sorted(words, key=frequencies.get):
+            counts = {}
+            for meeting_id, field, (count,) in self._term_entries(word, False, candidates):
+                counts[meeting_id] = counts.get(meeting_id, 0.0) + FIELD_WEIGHTS[field] * count
+            if candidates is None and (since or until):
+                counts = {
+                    meeting_id: count for meeting_id, count in counts.items()
+                    if (since is None or self._recorded_at[meeting_id] >= since)
+                    and (until is None or self._recorded_at[meeting_id] <= until)
+                }
+            weighted_counts[word] = counts
+            candidates = sorted(counts)
+            if not candidates:
+                return []
+
+        total = max(len(self.meetings), 1)
+        idf = {word: math.log(1 + total / frequency) for word, frequency in frequencies.items()}
+        phrase_counts = []
+        for phrase in phrases:
+            if len(phrase) == 1:
+                # A single word or word pair: its count is the phrase count
+                matched = {meeting_id: weighted_counts[phrase[0]][meeting_id] for meeting_id in candidates}
+                phrase_counts.append((idf[phrase[0]], matched))
+                continue
+            # Positions of each word pair keyed by (meeting, field), decoded
+            # only for the meetings that contain every pair
+            word_positions = []
+            for word in dict.fromkeys(phrase):
+                positions = {(meeting_id, field): set(hits)
+                             for meeting_id, field, hits in self._term_entries(word, True, candidates)}
+                word_positions.append((word, positions))
+            word_positions = dict(word_positions)
+            matched = {}
+            for (meeting_id, field), starts in word_positions[phrase[0]].items():
+                for offset in range(1, len(phrase)):
+                    hits = word_positions[phrase[offset]].get((meeting_id, field), ())
+                    starts = starts.intersection([hit - offset for hit in hits])
+                    if not starts:
+                        break
+                count = len(starts)
+                if count:
+                    matched[meeting_id] = matched.get(meeting_id, 0.0) + FIELD_WEIGHTS[field] * count
+            phrase_counts.append((sum(idf[word] for word in phrase), matched))
+            candidates = sorted(matched)
+            if not candidates:
+                return []
+
+        scores = {}
+        for meeting_id in candidates:
+            score = 0.0
+            for term in dict.fromkeys(terms):
+                weighted_count = weighted_counts[term][meeting_id]
+                score += idf[term] * weighted_count / (weighted_count + 1.0)
+            for phrase_idf, matched in phrase_counts:
+                score += phrase_idf * matched[meeting_id] / (matched[meeting_id] + 1.0)
+            scores[meeting_id] = score
+
+        ranked = heapq.nsmallest(limit, candidates, key=lambda meeting_id: (-scores[meeting_id], -meeting_id))
+        return [dict(self.meetings[meeting_id], score=round(scores[meeting_id], 4)) for meeting_id in ranked]
+
+def archive_meeting(transcript_file: str, summary_file: str, title: str = "",
+                    archive_dir: str = ARCHIVE_DIR) -> bool:
+    """
+    Add a transcript and summary pair to the meeting archive
+    """
+    try:
+        with open(transcript_file, "r", encoding="utf-8") as f:
+            transcript = f.read()
+        summary = ""
+        if os.path.exists(summary_file):
+            with open(summary_file, "r", encoding="utf-8") as f:
+                summary = f.read()
+        meeting_id = MeetingArchive(archive_dir).add_meeting(transcript, summary, title)
+        print(f"Archived meeting {meeting_id}")
+        return True
+    except Exception as e:
+        print(f"Error archiving meeting: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    usage = ("Usage: python meeting_archive.py add <transcript_file> <summary_file> [title]\n"
+             "       python meeting_archive.py search <query> [since] [until]")
+    if len(sys.argv) < 3 or sys.argv[1] not in ("add", "search"):
+        print(usage)
+        sys.exit(1)
+
+    if sys.argv[1] == "add":
+        if len(sys.argv) not in (4, 5):
+            print(usage)
+            sys.exit(1)
+        title = sys.argv[4] if len(sys.argv) == 5 else ""
+        if not archive_meeting(sys.argv[2], sys.argv[3], title):
+            sys.exit(1)
+    else:
+        since = parse_time(sys.argv[3]) if len(sys.argv) > 3 else None
+        until = parse_time(sys.argv[4], end_of_day=True) if len(sys.argv) > 4 else None
+        for result in MeetingArchive().search(sys.argv[2], since, until):
+            print(f"[{result['id']}] {result['recorded_at']}  {result['title']}  (score {result['score']})")
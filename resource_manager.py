@@ -0,0 +1,264 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+ROLES = ("transcribe", "summarize")
+
+def available_cores() -> List[int]:
+    """Return the CPU cores this process is allowed to run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def split_workers(total_workers: int, transcribe_backlog: int, summarize_backlog: int) -> Dict[str, int]:
+    """Divide workers between roles in proportion to their backlog
+
+    A role with no backlog gets no workers, so a single kind of job can use
+    all of them; otherwise each role keeps at least one.
+    """
+    if summarize_backlog == 0:
+        return {"transcribe": total_workers, "summarize": 0}
+    if transcribe_backlog == 0:
+        return {"transcribe": 0, "summarize": total_workers}
+    if total_workers < 2:
+        return {"transcribe": 1, "summarize": 1}
+    backlog = transcribe_backlog + summarize_backlog
+    transcribe_workers = round(total_workers * transcribe_backlog / backlog)
+    transcribe_workers = min(max(transcribe_workers, 1), total_workers - 1)
+    return {"transcribe": transcribe_workers, "summarize": total_workers - transcribe_workers}
+
+def partition_cores(cores: List[int], workers: Dict[str, int]) -> Dict[str, List[List[int]]]:
+    """Give each worker a disjoint, contiguous share of the cores
+
+    When there are more workers than cores, neighbouring workers share a
+    core rather than being left with none.
+    """
+    total_workers = sum(workers.values())
+    shares = []
+    for index in range(total_workers):
+        start = index * len(cores) // total_workers
+        end = (index + 1) * len(cores) // total_workers
+        shares.append(cores[start:end] or [cores[start]])
+    partition = {}
+    for role in ROLES:
+        partition[role] = [shares.pop(0) for _ in range(workers.get(role, 0))]
+    return partition
+
+def pin_thread(cores: List[int]) -> None:
+    """Pin the calling thread to cores where the platform supports it"""
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError as e:
+            print(f"Warning: Could not set CPU affinity: {str(e)}")
+
+def torch_threads() -> Optional[int]:
+    """Return torch's intra-op thread count, or None if torch is not installed"""
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch.get_num_threads()
+
+def set_torch_threads(count: int) -> None:
+    """Set torch's process-wide intra-op thread count if torch is installed"""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(count)
+
+def set_torch_interop_threads(count: int) -> None:
+    """Set torch's inter-op thread count if torch is installed and it can still be set"""
+    try:
+        import torch
+    except ImportError:
+        return
+    try:
+        torch.set_num_interop_threads(count)
+    except RuntimeError:
+        # Can only be set before torch runs any parallel work in this process
+        pass
+
+class CPUResourceManager:
+    """Hand out CPU core sets to transcription and summarization workers
+
+    A job takes a slot of its role with worker(). The cores are divided into
+    one slot per job running or queued, up to total_workers (default: one
+    per core), and split between roles by their backlog. A lone job gets
+    every core; jobs queued together share them. Running jobs always hold
+    disjoint core sets, so a job that arrives while others hold all the
+    cores waits for them to finish, then the cores are divided again.
+
+    Jobs run as threads of one process, so the guarantees are:
+    - the job's thread is pinned to its cores; threads torch created
+      earlier keep the affinity they started with
+    - torch's intra-op thread count is process-wide, so it is kept at the
+      smallest core set held by a running job and restored once no jobs run.
+      Slots are equal-sized to within one core, so running jobs together
+      use about as many threads as there are cores.
+    - torch's inter-op pool is set to one thread before the first job, since
+      jobs already run side by side; this only takes effect if torch has not
+      run parallel work yet
+    """
+
+    def __init__(self, total_workers: Optional[int] = None, cores: Optional[List[int]] = None):
+        self.cores = cores or available_cores()
+        self.total_workers = total_workers or len(self.cores)
+        self._condition = threading.Condition()
+        self._waiting = {role: 0 for role in ROLES}
+        self._busy = {}
+        self._job_cpu = {}
+        self._stats = {}
+        self._idle_torch_threads = None
+        self._interop_configured = False
+        self._started = time.monotonic()
+        self._cpu_mark = time.process_time()
+        self._apply_split(split_workers(1, 0, 0))
+
+    def _apply_split(self, workers: Dict[str, int]) -> None:
+        self._workers = workers
+        self._partition = partition_cores(self.cores, workers)
+
+    def _backlog(self, role: str) -> int:
+        """Jobs of a role that are running or waiting for a slot"""
+        return self._waiting[role] + sum(1 for busy_role, _ in self._busy if busy_role == role)
+
+    def rebalance(self, transcribe_backlog: Optional[int] = None,
+                  summarize_backlog: Optional[int] = None) -> Dict[str, int]:
+        """Resplit the cores by backlog, defaulting to the jobs running or waiting for a slot"""
+        with self._condition:
+            if transcribe_backlog is None:
+                transcribe_backlog = self._backlog("transcribe")
+            if summarize_backlog is None:
+                summarize_backlog = self._backlog("summarize")
+            total_workers = max(1, min(self.total_workers, transcribe_backlog + summarize_backlog))
+            workers = split_workers(total_workers, transcribe_backlog, summarize_backlog)
+            if workers != self._workers:
+                self._apply_split(workers)
+                self._condition.notify_all()
+            return dict(workers)
+
+    def _free_slot(self, role: str) -> Optional[int]:
+        """Find a slot that is idle and shares no core with a running job"""
+        held = set()
+        for cores in self._busy.values():
+            held.update(cores)
+        for slot, cores in enumerate(self._partition[role]):
+            if (role, slot) not in self._busy and held.isdisjoint(cores):
+                return slot
+        return None
+
+    def _update_torch_threads(self) -> None:
+        """Size torch's shared thread pool for the jobs now running"""
+        if self._busy:
+            if self._idle_torch_threads is None:
+                self._idle_torch_threads = torch_threads()
+            set_torch_threads(min(len(cores) for cores in self._busy.values()))
+        elif self._idle_torch_threads is not None:
+            set_torch_threads(self._idle_torch_threads)
+            self._idle_torch_threads = None
+
+    def _charge_cpu(self) -> None:
+        """Split the process CPU time since the last job change among the running jobs by core count"""
+        now = time.process_time()
+        spent = now - self._cpu_mark
+        self._cpu_mark = now
+        held = sum(len(cores) for cores in self._busy.values())
+        for job, cores in self._busy.items():
+            self._job_cpu[job] += spent * len(cores) / held
+
+    @contextmanager
+    def worker(self, role: str):
+        """Run the enclosed job on a slot of the given role, waiting for one if needed"""
+        if role not in ROLES:
+            raise ValueError(f"Unknown worker role: {role}")
+        with self._condition:
+            self._waiting[role] += 1
+            try:
+                while True:
+                    self.rebalance()
+                    slot = self._free_slot(role)
+                    if slot is not None:
+                        break
+                    self._condition.wait(timeout=1.0)
+            finally:
+                self._waiting[role] -= 1
+            if not self._interop_configured:
+                set_torch_interop_threads(1)
+                self._interop_configured = True
+            job = (role, slot)
+            cores = list(self._partition[role][slot])
+            self._charge_cpu()
+            self._busy[job] = cores
+            self._job_cpu[job] = 0.0
+            self._update_torch_threads()
+
+        previous_cores = available_cores()
+        pin_thread(cores)
+        wall_start = time.monotonic()
+        try:
+            yield cores
+        finally:
+            wall = time.monotonic() - wall_start
+            with self._condition:
+                self._charge_cpu()
+                del self._busy[job]
+                stats = self._stats.setdefault(role, {"jobs": 0, "busy_seconds": 0.0,
+                                                      "cpu_seconds": 0.0, "core_seconds": 0.0})
+                stats["jobs"] += 1
+                stats["busy_seconds"] += wall
+                stats["cpu_seconds"] += self._job_cpu.pop(job)
+                stats["core_seconds"] += wall * len(cores)
+                self._update_torch_threads()
+                self._condition.notify_all()
+            if hasattr(os, "sched_setaffinity"):
+                try:
+                    os.sched_setaffinity(0, previous_cores)
+                except OSError:
+                    pass
+
+    def allocation(self) -> Dict[str, List[List[int]]]:
+        """Return the cores assigned to each worker slot, by role"""
+        with self._condition:
+            return {role: [list(cores) for cores in slots] for role, slots in self._partition.items()}
+
+    def utilization(self) -> Dict[str, dict]:
+        """Report per-role job counts, busy fraction and CPU use of the allotted cores
+
+        busy_fraction is the average number of jobs of the role running, so
+        it can exceed 1 when they run side by side. cpu_utilization is the
+        process CPU time, including torch's worker threads, over each job's
+        cores and wall time; time spent while several jobs ran is split
+        between them by core count.
+        """
+        with self._condition:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            report = {}
+            for name, stats in self._stats.items():
+                report[name] = {
+                    "jobs": stats["jobs"],
+                    "busy_fraction": round(stats["busy_seconds"] / elapsed, 4),
+                    "cpu_utilization": round(stats["cpu_seconds"] / max(stats["core_seconds"], 1e-9), 4)
+                }
+            return report
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_resource_manager() -> CPUResourceManager:
+    """Return the process-wide resource manager, creating it on first use"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = CPUResourceManager()
+        return _manager
+
+if __name__ == "__main__":
+    manager = get_resource_manager()
+    print(f"Cores: {manager.cores}")
+    for role, slots in manager.allocation().items():
+        for slot, cores in enumerate(slots):
+            print(f"{role}-{slot}: cores {cores}")
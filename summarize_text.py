@@ -1,9 +1,20 @@
 import sys
+import os
 import re
+import json
+import hashlib
+import threading
 from datetime import datetime
-from transformers import pipeline
-import torch
-from typing import List
+from typing import Dict, List
+from admission_control import get_admission_controller
+
+# Summarization models in order of preference, with their display names
+SUMMARY_MODEL_NAMES = {
+    "facebook/bart-large-cnn": "BART Large CNN",
+    "sshleifer/distilbart-cnn-6-6": "DistilBART CNN 6-6"
+}
+SUMMARY_CACHE_FILE = "summary_cache.json"
+SUMMARY_CACHE_MAX_ENTRIES = 2000
 
 def clean_text(text: str) -> str:
     """Clean and format the text for better summarization"""
@@ -15,29 +26,93 @@ def clean_text(text: str) -> str:
     text = re.sub(r'\s*([.,!?])\s*', r'\1 ', text)
     return text
 
-def split_into_chunks(text: str, max_length: int = 1024) -> List[str]:
-    """Split text into chunks that the model can process"""
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+def split_into_chunks(text: str, max_length: int = 700, min_length: int = 256,
+                      boundary_divisor: int = 16) -> List[str]:
+    """Split text into chunks that the model can process
+
+    max_length is in words; 700 words stays within BART's 1024-token input
+    for ordinary speech, so chunks aren't cut short by truncation.
+    Chunk boundaries are chosen from the content of the sentences rather than
+    from a running word count, so an edit only moves the boundaries next to
+    it and the chunks after it keep the same text (and the same cache key).
+    """
+    sentences = []
+    for sentence in re.split(r'(?<=[.!?])\s+', text):
+        # Break up run-on sentences (e.g. unpunctuated transcripts) that exceed a chunk
+        sentences.extend(split_run_on(sentence, max_length, boundary_divisor))
     chunks = []
     current_chunk = []
     current_length = 0
     
     for sentence in sentences:
         sentence_length = len(sentence.split())
-        if current_length + sentence_length > max_length:
-            if current_chunk:
-                chunks.append(' '.join(current_chunk))
-            current_chunk = [sentence]
-            current_length = sentence_length
-        else:
-            current_chunk.append(sentence)
-            current_length += sentence_length
+        if current_length + sentence_length > max_length and current_chunk:
+            chunks.append(' '.join(current_chunk))
+            current_chunk = []
+            current_length = 0
+        current_chunk.append(sentence)
+        current_length += sentence_length
+        # Close the chunk after a sentence whose hash hits the divisor
+        if current_length >= min_length and int(chunk_key(sentence)[:8], 16) % boundary_divisor == 0:
+            chunks.append(' '.join(current_chunk))
+            current_chunk = []
+            current_length = 0
     
     if current_chunk:
         chunks.append(' '.join(current_chunk))
     
     return chunks
 
+def split_run_on(sentence: str, max_length: int = 700, boundary_divisor: int = 16) -> List[str]:
+    """Split a sentence longer than max_length words into sentence-sized pieces
+
+    A piece ends after each word whose hash hits the divisor, so the cuts
+    depend on the content rather than on word positions, and inserting a
+    word only changes the piece it lands in.
+    """
+    words = sentence.split()
+    if len(words) <= max_length:
+        return [sentence]
+    pieces = []
+    start = 0
+    for index, word in enumerate(words):
+        if index + 1 - start == max_length or int(chunk_key(word)[:8], 16) % boundary_divisor == 0:
+            pieces.append(' '.join(words[start:index + 1]))
+            start = index + 1
+    if start < len(words):
+        pieces.append(' '.join(words[start:]))
+    return pieces
+
+def normalize_chunk(chunk: str) -> str:
+    """Normalize chunk text so whitespace-only changes don't invalidate the cache"""
+    return re.sub(r'\s+', ' ', chunk).strip()
+
+def chunk_key(chunk: str) -> str:
+    """Return a stable hash of the chunk's normalized text"""
+    return hashlib.sha256(normalize_chunk(chunk).encode("utf-8")).hexdigest()
+
+def load_summary_cache(cache_file: str = SUMMARY_CACHE_FILE) -> Dict[str, str]:
+    """Load previously generated chunk summaries keyed by model and chunk hash"""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get("chunks", {})
+
+def save_summary_cache(chunk_summaries: Dict[str, str], cache_file: str = SUMMARY_CACHE_FILE) -> None:
+    """Persist chunk summaries, keeping only the most recent entries"""
+    keys = list(chunk_summaries)[-SUMMARY_CACHE_MAX_ENTRIES:]
+    # Write a temporary file and swap it in, so a concurrent save or a crash
+    # never leaves a truncated cache behind
+    temp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump({"chunks": {key: chunk_summaries[key] for key in keys}}, f)
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not save summary cache: {str(e)}")
+
 def extract_key_points(text: str) -> List[str]:
     """Extract key points using keyword matching"""
     important_keywords = [
@@ -57,13 +132,18 @@ def extract_key_points(text: str) -> List[str]:
     
     return key_points
 
-def format_summary(summary_text: str, key_points: List[str]) -> str:
+def extract_action_items(key_points: List[str]) -> List[str]:
+    """Pick the key points that read like action items"""
+    action_words = ['action', 'task', 'need', 'must', 'should', 'will', 'deadline']
+    return [point for point in key_points if any(word in point.lower() for word in action_words)]
+
+def format_summary(summary_text: str, key_points: List[str], model_name: str = "BART Large CNN") -> str:
     """Format the summary with sections and structure"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     formatted_summary = f"""🤖 Local AI-Generated Meeting Summary
 📅 Generated on: {timestamp}
-📝 Model: BART Large CNN
+📝 Model: {model_name}
 {'=' * 50}
 
 OVERVIEW:
@@ -76,7 +156,7 @@ KEY POINTS IDENTIFIED:
         formatted_summary += f"• {point}\n"
     
     # Add potential action items section
-    action_items = [point for point in key_points if any(word in point.lower() for word in ['action', 'task', 'need', 'must', 'should', 'will', 'deadline'])]
+    action_items = extract_action_items(key_points)
     if action_items:
         formatted_summary += "\nPOTENTIAL ACTION ITEMS:\n"
         for item in action_items:
@@ -84,38 +164,97 @@ KEY POINTS IDENTIFIED:
     
     return formatted_summary
 
-def generate_summary(text: str) -> str:
-    """Generate a comprehensive meeting summary using BART"""
+def summarize_chunk_extractively(chunk: str, max_sentences: int = 3) -> str:
+    """Summarize a chunk by its key sentences when no model can be run"""
+    sentences = extract_key_points(chunk) or re.split(r'(?<=[.!?])\s+', chunk)
+    return ' '.join(sentences[:max_sentences])
+
+def generate_summary(text: str, cache_file: str = SUMMARY_CACHE_FILE) -> str:
+    """Generate a comprehensive meeting summary using BART
+
+    Chunk summaries are cached by model and the hash of the chunk text, and
+    a cached summary from any model is reused, so after an edit to the
+    transcript only the chunks that changed are re-summarized. The model and
+    batch size for those are chosen to fit the memory budget; when memory
+    stays short they use a smaller model, or key sentences as a last resort.
+    """
     try:
-        # Initialize the summarization pipeline
-        print("Loading summarization model (this may take a few minutes the first time)...")
-        summarizer = pipeline(
-            "summarization",
-            model="facebook/bart-large-cnn",
-            device=0 if torch.cuda.is_available() else -1
-        )
-        
         # Clean the text
         text = clean_text(text)
         
         # Split text into chunks if it's too long
         chunks = split_into_chunks(text)
+        chunk_keys = [chunk_key(chunk) for chunk in chunks]
+        chunk_summaries = load_summary_cache(cache_file)
+        
+        # Use the best cached summary of each chunk, from any model
+        keys = []
+        for key in chunk_keys:
+            cached = [f"{model}:{key}" for model in SUMMARY_MODEL_NAMES if f"{model}:{key}" in chunk_summaries]
+            keys.append(cached[0] if cached else None)
+        missing = [index for index, key in enumerate(keys) if key is None]
+        print(f"Reusing {len(chunks) - len(missing)} of {len(chunks)} cached chunk summaries")
+        
+        if missing:
+            controller = get_admission_controller()
+            with controller.admit(controller.summary_plans()) as plan:
+                if plan.model == "extractive":
+                    print("Not enough memory for an AI summary, using key sentences for the changed chunks")
+                else:
+                    print(f"Using {plan.model} with batch size {plan.batch_size} (~{plan.memory_mb}MB)")
+                    # Heavy imports are deferred so the CLI and app start without loading torch
+                    from transformers import pipeline
+                    import torch
+
+                    # Initialize the summarization pipeline
+                    print("Loading summarization model (this may take a few minutes the first time)...")
+                    summarizer = pipeline(
+                        "summarization",
+                        model=plan.model,
+                        device=0 if torch.cuda.is_available() else -1
+                    )
+                    
+                    # Generate summaries for the changed chunks
+                    print("Generating summary...")
+                    results = summarizer(
+                        [chunks[index] for index in missing],
+                        batch_size=plan.batch_size,
+                        truncation=True,
+                        max_length=150,
+                        min_length=50,
+                        do_sample=False
+                    )
+                    for index, result in zip(missing, results):
+                        keys[index] = f"{plan.model}:{chunk_keys[index]}"
+                        chunk_summaries[keys[index]] = result['summary_text']
+                    # Release the model before giving back its memory reservation
+                    del summarizer
+        
+        # Move the chunks in use to the end so they survive cache trimming
+        for key in keys:
+            if key is not None:
+                chunk_summaries[key] = chunk_summaries.pop(key)
+        save_summary_cache(chunk_summaries, cache_file)
         
-        # Generate summary for each chunk
-        print("Generating summary...")
-        summaries = []
-        for chunk in chunks:
-            summary = summarizer(chunk, max_length=150, min_length=50, do_sample=False)[0]['summary_text']
-            summaries.append(summary)
+        if all(key is None for key in keys):
+            return create_basic_summary(text)
         
-        # Combine summaries
-        combined_summary = " ".join(summaries)
+        # Combine summaries; extractive ones are not cached so a later run can replace them
+        combined_summary = " ".join(
+            chunk_summaries[key] if key is not None else summarize_chunk_extractively(chunk)
+            for key, chunk in zip(keys, chunks)
+        )
+        models = [model for model in SUMMARY_MODEL_NAMES
+                  if any(key is not None and key.startswith(f"{model}:") for key in keys)]
+        model_name = " + ".join(SUMMARY_MODEL_NAMES[model] for model in models)
+        if None in keys:
+            model_name += " + key sentences"
         
         # Extract key points
         key_points = extract_key_points(text)
         
         # Format the final summary
-        final_summary = format_summary(combined_summary, key_points)
+        final_summary = format_summary(combined_summary, key_points, model_name)
         
         return final_summary
         
@@ -1,12 +1,17 @@
-import whisper
 import sys
 import os
 import subprocess
-from pydub import AudioSegment
-import torch
+import wave
+from admission_control import get_admission_controller
+from transcription_profiles import (DECODING_PROFILES, DEFAULT_DECODING, MIN_LANGUAGE_CONFIDENCE,
+                                    build_initial_prompt, decoding_options, get_profile, save_profile)
+
+# whisper, torch and pydub are imported inside the functions that use them so
+# that the Streamlit header and CLI usage errors don't wait on torch loading
 
 def get_device():
     """Determine the best available device for processing"""
+    import torch
     return "cuda" if torch.cuda.is_available() else "cpu"
 
 def check_ffmpeg():
@@ -22,6 +27,7 @@ def check_ffmpeg():
 def convert_audio_to_wav(input_path, output_path):
     """Convert any audio format to WAV using pydub"""
     try:
+        from pydub import AudioSegment
         print(f"Converting audio file: {input_path}")
         audio = AudioSegment.from_file(input_path)
         
@@ -37,11 +43,58 @@ def convert_audio_to_wav(input_path, output_path):
         print(f"Error converting audio: {str(e)}")
         return False
 
-def transcribe_audio(audio_path):
+def probe_audio(audio_path):
+    """Read an audio file's duration, sample rate and channel count without decoding it
+
+    Uses ffprobe through pydub. If the duration can't be read, it is
+    estimated from the file size at a low 32 kbps bitrate, which errs long.
+    """
+    from pydub.utils import mediainfo
+    try:
+        info = mediainfo(audio_path)
+    except Exception as e:
+        print(f"Warning: Could not probe audio file: {str(e)}")
+        info = {}
+    try:
+        duration = float(info["duration"])
+    except (KeyError, ValueError):
+        duration = os.path.getsize(audio_path) / 4000
+    try:
+        sample_rate = int(info["sample_rate"])
+        channels = int(info["channels"])
+    except (KeyError, ValueError):
+        sample_rate, channels = 48000, 2
+    return duration, sample_rate, channels
+
+def detect_language(model, wav_path):
+    """Detect the spoken language from the first 30 seconds of audio
+
+    Only those 30 seconds are read from the 16kHz mono 16-bit WAV, rather
+    than decoding the whole file. Returns (language code, probability).
+    """
+    import numpy as np
+    import whisper
+    with wave.open(wav_path, "rb") as wav_file:
+        frames = wav_file.readframes(whisper.audio.N_SAMPLES)
+    audio = np.frombuffer(frames, np.int16).astype(np.float32) / 32768.0
+    audio = whisper.pad_or_trim(audio)
+    mel = whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels).to(model.device)
+    _, probs = model.detect_language(mel)
+    language = max(probs, key=probs.get)
+    return language, probs[language]
+
+def transcribe_audio(audio_path, profile_name=None, decoding=DEFAULT_DECODING):
     """
     Transcribe audio file using OpenAI's Whisper model with improved handling
+
+    profile_name selects a saved user or channel profile whose language and
+    vocabulary are reused, so language detection only runs for new profiles.
+    decoding picks a decoding profile: fast, balanced or accurate.
     """
     try:
+        options = decoding_options(decoding)
+        profile = get_profile(profile_name)
+        
         # Verify FFmpeg installation
         print("Checking FFmpeg installation...")
         if not check_ffmpeg():
@@ -56,28 +109,49 @@ def transcribe_audio(audio_path):
             
         print(f"File size: {os.path.getsize(abs_path)} bytes")
         
-        # Convert audio to WAV format
-        wav_path = os.path.join(os.getcwd(), "temp_audio.wav")
-        if not convert_audio_to_wav(abs_path, wav_path):
-            return False
-        
-        # Determine device and load appropriate model
-        device = get_device()
-        print(f"Using device: {device}")
-        
-        print("Loading Whisper model...")
-        model = whisper.load_model("small", device=device)
-        print("Model loaded successfully!")
-        
-        print("Transcribing audio...")
-        # Add transcription options for better results
-        result = model.transcribe(
-            wav_path,
-            language=None,  # Auto-detect language
-            task="transcribe",
-            fp16=False if device == "cpu" else True,
-            initial_prompt="This is a transcription of an audio file."
-        )
+        # Reserve memory before decoding anything: converting a long recording
+        # can peak higher than the model itself
+        controller = get_admission_controller()
+        duration, sample_rate, channels = probe_audio(abs_path)
+        with controller.admit(controller.transcription_plans(duration, sample_rate, channels)) as plan:
+            print(f"Audio duration: {duration:.1f}s, using Whisper '{plan.model}' (~{plan.memory_mb}MB)")
+            
+            # Convert audio to WAV format
+            wav_path = os.path.join(os.getcwd(), "temp_audio.wav")
+            if not convert_audio_to_wav(abs_path, wav_path):
+                return False
+            
+            # Determine device and load appropriate model
+            device = get_device()
+            print(f"Using device: {device}")
+            
+            print("Loading Whisper model...")
+            import whisper
+            model = whisper.load_model(plan.model, device=device)
+            print("Model loaded successfully!")
+            
+            language = profile.get("language")
+            if language:
+                print(f"Using language from profile '{profile_name}': {language}")
+            else:
+                print("Detecting language...")
+                language, confidence = detect_language(model, wav_path)
+                print(f"Detected language: {language} ({confidence:.0%})")
+                if profile_name and confidence >= MIN_LANGUAGE_CONFIDENCE:
+                    save_profile(profile_name, language=language)
+            
+            print(f"Transcribing audio with '{decoding}' decoding...")
+            # Add transcription options for better results
+            result = model.transcribe(
+                wav_path,
+                language=language,
+                task="transcribe",
+                fp16=False if device == "cpu" else True,
+                initial_prompt=build_initial_prompt(profile),
+                **options
+            )
+            # Release the model before giving back its memory reservation
+            del model
         print("Transcription complete!")
         
         # Clean up temporary WAV file
@@ -98,10 +172,6 @@ def transcribe_audio(audio_path):
         preview = result["text"][:100] + "..." if len(result["text"]) > 100 else result["text"]
         print(f"\nTranscription preview:\n{preview}")
         
-        # Print detected language
-        if "language" in result:
-            print(f"Detected language: {result['language']}")
-            
         return True
     except Exception as e:
         print(f"Error during transcription: {str(e)}")
@@ -112,11 +182,13 @@ def transcribe_audio(audio_path):
         return False
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python transcribe_audio.py <audio_file_path>")
+    decoding = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_DECODING
+    if len(sys.argv) not in (2, 3, 4) or decoding not in DECODING_PROFILES:
+        print(f"Usage: python transcribe_audio.py <audio_file_path> [profile] [{'|'.join(DECODING_PROFILES)}]")
         sys.exit(1)
     
     audio_file = sys.argv[1]
-    success = transcribe_audio(audio_file)
+    profile_name = sys.argv[2] if len(sys.argv) > 2 else None
+    success = transcribe_audio(audio_file, profile_name, decoding)
     if not success:
         sys.exit(1) 
\ No newline at end of file
@@ -0,0 +1,67 @@
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+PROFILES_FILE = "transcription_profiles.json"
+DEFAULT_PROMPT = "This is a transcription of an audio file."
+# Only remember a detected language when the probe is at least this sure
+MIN_LANGUAGE_CONFIDENCE = 0.6
+
+# Options passed to model.transcribe for each decoding profile
+DECODING_PROFILES = {
+    # Same as the original transcribe call: greedy decoding, retried at higher
+    # temperatures on failure with a single sample each
+    "balanced": {"temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)},
+    # Single greedy pass with no fallback, lowest latency
+    "fast": {"temperature": 0.0, "condition_on_previous_text": False},
+    # Beam search, and the best of five samples on temperature fallback; slowest but most accurate
+    "accurate": {"temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0), "beam_size": 5, "best_of": 5},
+}
+DEFAULT_DECODING = "balanced"
+
+def load_profiles(profiles_file: str = PROFILES_FILE) -> Dict[str, dict]:
+    """Load all saved transcription profiles keyed by profile name"""
+    try:
+        with open(profiles_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def get_profile(name: Optional[str], profiles_file: str = PROFILES_FILE) -> dict:
+    """Return the saved profile for a user or channel, or an empty one"""
+    if not name:
+        return {}
+    return load_profiles(profiles_file).get(name, {})
+
+def save_profile(name: str, language: Optional[str] = None, vocabulary: Optional[List[str]] = None,
+                 profiles_file: str = PROFILES_FILE) -> dict:
+    """Update a profile's language and/or vocabulary, leaving other fields as they were"""
+    profiles = load_profiles(profiles_file)
+    profile = profiles.setdefault(name, {})
+    if language is not None:
+        profile["language"] = language
+    if vocabulary is not None:
+        profile["vocabulary"] = [word.strip() for word in vocabulary if word.strip()]
+    profile["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    temp_file = profiles_file + ".tmp"
+    try:
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2, ensure_ascii=False)
+        os.replace(temp_file, profiles_file)
+    except OSError as e:
+        print(f"Warning: Could not save transcription profile: {str(e)}")
+    return profile
+
+def build_initial_prompt(profile: dict) -> str:
+    """Build Whisper's initial prompt, adding the profile's domain vocabulary"""
+    vocabulary = profile.get("vocabulary")
+    if not vocabulary:
+        return DEFAULT_PROMPT
+    return f"{DEFAULT_PROMPT} Terms used: {', '.join(vocabulary)}."
+
+def decoding_options(decoding: str) -> dict:
+    """Return the transcribe options for a decoding profile"""
+    if decoding not in DECODING_PROFILES:
+        raise ValueError(f"Unknown decoding profile: {decoding}. Choose from {', '.join(DECODING_PROFILES)}")
+    return dict(DECODING_PROFILES[decoding])